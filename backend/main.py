@@ -1,10 +1,17 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional
-from datetime import datetime
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+from typing import Any, List, Dict, Literal, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
 import asyncio
-from scraper import MLBScraper
+import json
+import re
+import threading
+import time
+from scraper import DEFAULT_INNINGS, MLBScraper
 
 app = FastAPI(title="MLB Strikeout Predictions API", version="1.0.0")
 
@@ -52,24 +59,140 @@ class Game(BaseModel):
     team_stats: Dict[str, Dict[str, float]]
     expected_batters: List[Batter]
 
+MAX_SCENARIOS = 1000
+
+class LineupSwap(BaseModel):
+    out: str
+    batter: Optional[Batter] = None
+
+class Scenario(BaseModel):
+    name: Optional[str] = None
+    game_id: int
+    side: Literal["home", "away"] = "home"
+    lineup_swaps: List[LineupSwap] = []
+    pitcher_handedness: Optional[Literal["L", "R"]] = None
+    innings_cap: Optional[float] = Field(None, gt=0, le=DEFAULT_INNINGS)
+    opponent_k_adjustment: float = 0.0
+
+class ScenarioRequest(BaseModel):
+    date: Optional[str] = None
+    scenarios: List[Scenario] = Field(..., max_length=MAX_SCENARIOS)
+
+class ScenarioResult(BaseModel):
+    name: Optional[str] = None
+    game_id: int
+    side: str
+    pitcher: Optional[str] = None
+    baseline_strikeouts: Optional[float] = None
+    projected_strikeouts: Optional[float] = None
+    confidence: Optional[int] = None
+    betting_line: Optional[str] = None
+    line_probabilities: Optional[Dict[str, float]] = None
+    placeholder_inputs: Optional[bool] = None
+    error: Optional[str] = None
+
 scraper = MLBScraper()
 
 @app.get("/")
 async def root():
     return {"message": "MLB Strikeout Predictions API", "version": "1.0.0"}
 
-@app.get("/api/games/today", response_model=List[Game])
-async def get_todays_games():
-    """Get today's MLB games with strikeout predictions"""
+# Slates are rebuilt at most once per TTL; each game is cached as pre-encoded
+# JSON fragments keyed by top-level field, so filtered and sparse responses are
+# assembled by joining bytes instead of re-serializing.
+SLATE_CACHE_TTL = 300  # seconds
+MOCK_SLATE_CACHE_TTL = 30  # seconds; retry soon after a failed scrape
+SLATE_CACHE_MAX_DATES = 8
+SLATE_DATE_RANGE = timedelta(days=366)
+
+GAME_FIELDS = list(Game.model_fields.keys())
+VIRTUAL_FIELDS = ["projection"]
+
+# Handlers run in the threadpool: _slate_cache_lock guards the cache itself and a
+# per-date build lock makes concurrent cold misses wait for a single scrape.
+_slate_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_slate_cache_lock = threading.Lock()
+_slate_build_locks: Dict[str, threading.Lock] = {}
+
+def parse_slate_date(date: Optional[str]) -> datetime:
+    """Parse a YYYY-MM-DD query parameter, defaulting to today"""
+    if not date:
+        return datetime.now()
     try:
-        # Get today's games
-        games_data = scraper.get_todays_games()
+        slate_date = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date '{date}', expected YYYY-MM-DD")
+    if abs(slate_date - datetime.now()) > SLATE_DATE_RANGE:
+        raise HTTPException(status_code=400, detail=f"Date '{date}' must be within a year of today")
+    return slate_date
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated sparse field list; None means every field"""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in GAME_FIELDS + VIRTUAL_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(GAME_FIELDS + VIRTUAL_FIELDS)}"
+        )
+    return requested
+
+def pitcher_inputs(name: str, stats: Dict, opponent_vs_rhp: float, opponent_vs_lhp: float,
+                   opponent_batters: List[Dict], baseline_strikeouts: float,
+                   placeholder: bool) -> Dict[str, Any]:
+    """Raw projection inputs for one starting pitcher against the opposing lineup,
+    plus the projection the games endpoints serve for them. ``placeholder``
+    marks opponent splits and lineups that are fixed values, not real data."""
+    return {
+        "pitcher": name,
+        "pitcher_stats": stats,
+        "opponent_k_rates": {"R": opponent_vs_rhp, "L": opponent_vs_lhp},
+        "batters": opponent_batters,
+        "baseline_strikeouts": baseline_strikeouts,
+        "placeholder": placeholder
+    }
+
+def inputs_from_game(game: Game, lineups: Dict[str, List[Batter]]) -> Dict[str, Dict[str, Any]]:
+    """Rebuild projection inputs from a finished game, with each pitcher facing
+    the opposing team's lineup from ``lineups`` (keyed by team name)"""
+    inputs = {}
+    for side, opponent in (("home", "away"), ("away", "home")):
+        pitcher = getattr(game, f"{side}_pitcher")
+        opponent_team = getattr(game, f"{opponent}_team")["name"]
+        inputs[side] = pitcher_inputs(
+            pitcher.name,
+            {**pitcher.stats.model_dump(), "handedness": pitcher.handedness},
+            game.team_stats[opponent]["vsRHP"],
+            game.team_stats[opponent]["vsLHP"],
+            [batter.model_dump() for batter in lineups[opponent_team]],
+            pitcher.projection.projected_strikeouts,
+            True
+        )
+    return inputs
+
+def mock_slate() -> Tuple[List[Game], Dict[int, Dict[str, Dict[str, Any]]], bool]:
+    games = get_mock_games()
+    lineups = get_mock_lineups()
+    return games, {game.id: inputs_from_game(game, lineups) for game in games}, True
+
+def build_games(slate_date: datetime) -> Tuple[List[Game], Dict[int, Dict[str, Dict[str, Any]]], bool]:
+    """Scrape a slate and build its games with strikeout predictions
+    
+    Also returns the raw projection inputs per game id and side so what-if
+    scenarios can be replayed without scraping again, and whether the slate
+    fell back to mock data.
+    """
+    try:
+        games_data = scraper.get_todays_games(slate_date)
         
         if not games_data:
             # Return mock data if scraping fails
-            return get_mock_games()
+            return mock_slate()
         
         games = []
+        inputs = {}
         
         for idx, game_data in enumerate(games_data[:5]):  # Limit to 5 games to avoid rate limits
             try:
@@ -137,16 +260,253 @@ async def get_todays_games():
                 )
                 
                 games.append(game)
+                inputs[game.id] = {
+                    "home": pitcher_inputs(home_pitcher_name, home_pitcher_stats, away_vs_rhp, away_vs_lhp,
+                                           away_batters, home_projection['projected_strikeouts'],
+                                           scraper.PLACEHOLDER_OPPONENT_INPUTS),
+                    "away": pitcher_inputs(away_pitcher_name, away_pitcher_stats, home_vs_rhp, home_vs_lhp,
+                                           home_batters, away_projection['projected_strikeouts'],
+                                           scraper.PLACEHOLDER_OPPONENT_INPUTS)
+                }
                 
             except Exception as e:
                 print(f"Error processing game {idx}: {e}")
                 continue
         
-        return games if games else get_mock_games()
+        return (games, inputs, False) if games else mock_slate()
         
     except Exception as e:
-        print(f"Error in get_todays_games: {e}")
-        return get_mock_games()
+        print(f"Error in build_games: {e}")
+        return mock_slate()
+
+def encode_fragment(field: str, value: Any) -> bytes:
+    """Encode one ``"field":value`` JSON member, ready to be joined into an object"""
+    return json.dumps({field: value}, ensure_ascii=False, separators=(",", ":"))[1:-1].encode("utf-8")
+
+def join_json(members: List[bytes], open_: bytes = b"{", close: bytes = b"}") -> bytes:
+    return open_ + b",".join(members) + close
+
+def build_game_fragments(game: Game) -> Dict[str, Any]:
+    """Encode a game once into per-field JSON fragments, plus the virtual ``projection`` field
+    
+    ``data`` keeps the decoded values for filtering and ``full`` is the
+    complete game, so unfiltered responses are a plain join.
+    """
+    data = jsonable_encoder(game)
+    data["projection"] = {
+        "home": data["home_pitcher"]["projection"],
+        "away": data["away_pitcher"]["projection"],
+    }
+    encoded = {field: encode_fragment(field, value) for field, value in data.items()}
+    return {
+        "data": data,
+        "encoded": encoded,
+        "full": join_json([encoded[field] for field in GAME_FIELDS])
+    }
+
+def evict_slates() -> None:
+    """Drop expired slates, then the least recently used beyond SLATE_CACHE_MAX_DATES
+    
+    Callers must hold ``_slate_cache_lock``.
+    """
+    now = time.time()
+    for key in [key for key, entry in _slate_cache.items() if entry["expires_at"] <= now]:
+        del _slate_cache[key]
+    while len(_slate_cache) > SLATE_CACHE_MAX_DATES:
+        _slate_cache.popitem(last=False)
+
+def cached_slate(key: str) -> Optional[Dict[str, Any]]:
+    """Return a live cache entry and mark it most recently used; needs the lock"""
+    entry = _slate_cache.get(key)
+    if entry is None or entry["expires_at"] <= time.time():
+        return None
+    _slate_cache.move_to_end(key)
+    return entry
+
+def load_slate(slate_date: datetime) -> Dict[str, Any]:
+    """Return the cached slate entry for a date, rebuilding once the TTL expires
+    
+    Mock fallbacks are only kept briefly so a transient scrape failure does
+    not pin mock data in place for the full TTL.
+    """
+    key = slate_date.strftime("%Y-%m-%d")
+    with _slate_cache_lock:
+        entry = cached_slate(key)
+        if entry is not None:
+            return entry
+        build_lock = _slate_build_locks.setdefault(key, threading.Lock())
+    
+    with build_lock:
+        # Another thread may have built this slate while we waited
+        with _slate_cache_lock:
+            entry = cached_slate(key)
+            if entry is not None:
+                return entry
+        
+        games, inputs, is_mock = build_games(slate_date)
+        ttl = MOCK_SLATE_CACHE_TTL if is_mock else SLATE_CACHE_TTL
+        entry = {
+            "expires_at": time.time() + ttl,
+            "games": [build_game_fragments(game) for game in games],
+            "inputs": inputs
+        }
+        with _slate_cache_lock:
+            _slate_cache[key] = entry
+            _slate_cache.move_to_end(key)
+            evict_slates()
+            _slate_build_locks.pop(key, None)
+        return entry
+
+def get_slate(slate_date: datetime) -> List[Dict[str, Any]]:
+    """Return cached game fragments for a slate"""
+    return load_slate(slate_date)["games"]
+
+def select_fields(fragments: Dict[str, Any], fields: Optional[List[str]]) -> bytes:
+    """Assemble a JSON game from cached fragments; ``id`` is always included"""
+    if fields is None:
+        return fragments["full"]
+    encoded = fragments["encoded"]
+    return join_json([encoded["id"]] + [encoded[field] for field in fields if field != "id"])
+
+def matches_team(fragments: Dict[str, Any], team: str) -> bool:
+    """Match a team filter against either side's abbreviation, or the start of
+    a word in its full name ("NYY", "Yankees", "new york", "red s")"""
+    team = team.strip().lower()
+    if not team:
+        return True
+    word_prefix = re.compile(r"\b" + re.escape(team))
+    for side in ("home_team", "away_team"):
+        data = fragments["data"][side]
+        if team == data["abbr"].lower() or word_prefix.search(data["name"].lower()):
+            return True
+    return False
+
+# The games endpoints return pre-encoded JSON directly, so ``responses`` only
+# documents the shape: a full game is a ``Game``, and ``fields`` trims it.
+SPARSE_GAME_DESCRIPTION = (
+    "Games in the ``Game`` shape. With ``fields``, each game only has ``id`` plus the "
+    "requested fields; the virtual ``projection`` field is "
+    "``{\"home\": Projection, \"away\": Projection}``."
+)
+
+@app.get("/api/games/today", responses={200: {"model": List[Game], "description": SPARSE_GAME_DESCRIPTION}})
+def get_todays_games(team: Optional[str] = None, date: Optional[str] = None, fields: Optional[str] = None):
+    """Get today's MLB games with strikeout predictions
+    
+    Optional filters: ``team`` (abbreviation, or a word prefix of the name),
+    ``date`` (YYYY-MM-DD, within a year of today) and ``fields``
+    (comma-separated, e.g. ``projection``) for sparse payloads. Each item has
+    the ``Game`` shape limited to ``id`` plus the requested fields; the
+    virtual ``projection`` field is ``{"home": Projection, "away": Projection}``.
+    """
+    selected_fields = parse_fields(fields)
+    slate = get_slate(parse_slate_date(date))
+    
+    if team:
+        slate = [fragments for fragments in slate if matches_team(fragments, team)]
+    
+    body = join_json([select_fields(fragments, selected_fields) for fragments in slate], b"[", b"]")
+    return Response(content=body, media_type="application/json")
+
+@app.get("/api/games/{game_id}", responses={
+    200: {"model": Game, "description": SPARSE_GAME_DESCRIPTION},
+    404: {"description": "Game not found"}
+})
+def get_game(game_id: int, date: Optional[str] = None, fields: Optional[str] = None):
+    """Get a single game from the slate, optionally limited to ``fields``
+    
+    Same shape and query parameters as an item of ``/api/games/today``.
+    """
+    selected_fields = parse_fields(fields)
+    
+    for fragments in get_slate(parse_slate_date(date)):
+        if fragments["data"]["id"] == game_id:
+            return Response(content=select_fields(fragments, selected_fields), media_type="application/json")
+    
+    raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+
+def replacement_batter(name: str) -> Dict:
+    """League-average bench bat that takes a sat batter's lineup slot"""
+    return {**scraper._default_batters()[0], 'name': f"Replacement for {name}", 'vs_pitcher_history': 0}
+
+def apply_scenario(baseline: Dict[str, Any], scenario: Scenario) -> Dict[str, Any]:
+    """Turn a pitcher's baseline inputs plus scenario overrides into projection inputs
+    
+    A swap without a ``batter`` sits that batter in favour of a league-average
+    replacement, so the lineup keeps its length. Adjusted K rates are floored
+    at 0. Raises ValueError for swaps or lineups that cannot be projected.
+    """
+    batters = list(baseline["batters"])
+    for swap in scenario.lineup_swaps:
+        position = next((i for i, batter in enumerate(batters) if batter["name"] == swap.out), None)
+        if position is None:
+            raise ValueError(f"Batter '{swap.out}' is not in the opposing lineup")
+        batters[position] = swap.batter.model_dump() if swap.batter else replacement_batter(swap.out)
+    
+    if not batters:
+        raise ValueError("The opposing lineup is empty")
+    
+    adjustment = scenario.opponent_k_adjustment
+    handedness = scenario.pitcher_handedness or baseline["pitcher_stats"]["handedness"]
+    return {
+        "pitcher_stats": {**baseline["pitcher_stats"], "handedness": handedness},
+        "team_k_rate": max(0.0, baseline["opponent_k_rates"][handedness] + adjustment),
+        "batters": [{**batter, "k_rate": max(0.0, batter["k_rate"] + adjustment)} for batter in batters],
+        "innings": scenario.innings_cap or DEFAULT_INNINGS
+    }
+
+@app.post("/api/scenarios", response_model=List[ScenarioResult], response_model_exclude_none=True)
+def run_scenarios(request: ScenarioRequest):
+    """Project strikeouts for a batch of what-if scenarios against the slate
+    
+    Baseline inputs come from the cached slate, so each game is scraped at most
+    once per request. ``baseline_strikeouts`` is the projection the games
+    endpoints serve for the same pitcher. ``placeholder_inputs`` is true while
+    the opponent's splits and lineup are fixed values (mock data, or the
+    scraper's placeholder helpers), in which case results only reflect the
+    pitcher-side overrides and should not be read as real what-ifs.
+    
+    A scenario that cannot be projected (unknown game, batter not in the
+    lineup) gets an ``error`` in its own result; the rest of the batch is
+    still projected.
+    """
+    slate_inputs = load_slate(parse_slate_date(request.date))["inputs"]
+    
+    results = []
+    pending = []
+    scales = {}
+    for scenario in request.scenarios:
+        result = {"name": scenario.name, "game_id": scenario.game_id, "side": scenario.side}
+        results.append(result)
+        if scenario.game_id not in slate_inputs:
+            result["error"] = f"Game {scenario.game_id} not found"
+            continue
+        
+        baseline = slate_inputs[scenario.game_id][scenario.side]
+        result.update(
+            pitcher=baseline["pitcher"],
+            baseline_strikeouts=baseline["baseline_strikeouts"],
+            placeholder_inputs=baseline["placeholder"]
+        )
+        try:
+            projection_input = apply_scenario(baseline, scenario)
+        except ValueError as e:
+            result["error"] = str(e)
+            continue
+        
+        # Scenarios move the projection the games endpoints serve: each pitcher's
+        # unmodified model projection sets the scale applied to their scenarios
+        key = (scenario.game_id, scenario.side)
+        if key not in scales:
+            model = scraper.expected_strikeouts(**apply_scenario(baseline, Scenario(game_id=key[0], side=key[1])))
+            scales[key] = baseline["baseline_strikeouts"] / model if model > 0 else 1.0
+        pending.append((result, {**projection_input, "scale": scales[key]}))
+    
+    projections = scraper.calculate_strikeout_projections([projection_input for _, projection_input in pending])
+    for (result, _), projection in zip(pending, projections):
+        result.update(projection)
+    
+    return [ScenarioResult(**result) for result in results]
 
 def get_probable_pitcher(team: str) -> str:
     """Get probable starting pitcher - would need more sophisticated scraping"""
@@ -165,6 +525,23 @@ def get_probable_pitcher(team: str) -> str:
     }
     return pitcher_map.get(team, f"{team} Starter")
 
+def get_mock_lineups() -> Dict[str, List[Batter]]:
+    """Mock expected batters by team"""
+    return {
+        "Red Sox": [
+            Batter(name="Rafael Devers", k_rate=18.5, handedness="L", vs_pitcher_history=3),
+            Batter(name="Xander Bogaerts", k_rate=15.2, handedness="R", vs_pitcher_history=1),
+            Batter(name="J.D. Martinez", k_rate=24.1, handedness="R", vs_pitcher_history=5),
+            Batter(name="Alex Verdugo", k_rate=19.8, handedness="L", vs_pitcher_history=2)
+        ],
+        "Yankees": [
+            Batter(name="Aaron Judge", k_rate=28.2, handedness="R", vs_pitcher_history=4),
+            Batter(name="Anthony Rizzo", k_rate=22.1, handedness="L", vs_pitcher_history=2),
+            Batter(name="Gleyber Torres", k_rate=20.5, handedness="R", vs_pitcher_history=3),
+            Batter(name="Giancarlo Stanton", k_rate=31.8, handedness="R", vs_pitcher_history=6)
+        ]
+    }
+
 def get_mock_games() -> List[Game]:
     """Return mock games if scraping fails"""
     return [
@@ -191,16 +568,7 @@ def get_mock_games() -> List[Game]:
                 "home": {"vsRHP": 22.1, "vsLHP": 24.8},
                 "away": {"vsRHP": 23.4, "vsLHP": 21.9}
             },
-            expected_batters=[
-                Batter(name="Rafael Devers", k_rate=18.5, handedness="L", vs_pitcher_history=3),
-                Batter(name="Xander Bogaerts", k_rate=15.2, handedness="R", vs_pitcher_history=1),
-                Batter(name="J.D. Martinez", k_rate=24.1, handedness="R", vs_pitcher_history=5),
-                Batter(name="Alex Verdugo", k_rate=19.8, handedness="L", vs_pitcher_history=2),
-                Batter(name="Aaron Judge", k_rate=28.2, handedness="R", vs_pitcher_history=4),
-                Batter(name="Anthony Rizzo", k_rate=22.1, handedness="L", vs_pitcher_history=2),
-                Batter(name="Gleyber Torres", k_rate=20.5, handedness="R", vs_pitcher_history=3),
-                Batter(name="Giancarlo Stanton", k_rate=31.8, handedness="R", vs_pitcher_history=6)
-            ]
+            expected_batters=get_mock_lineups()["Red Sox"] + get_mock_lineups()["Yankees"]
         )
     ]
 
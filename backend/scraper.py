@@ -1,11 +1,22 @@
 import requests
 from bs4 import BeautifulSoup
+import math
 import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+LEAGUE_K_RATE = 22.5
+BATTERS_FACED_PER_INNING = 4.3
+DEFAULT_INNINGS = 5.5
+PLATOON_FACTOR = {True: 1.08, False: 0.94}  # same-handed vs opposite-handed batter
+BETTING_LINES = [2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5]
 
 
 class MLBScraper:
+    # Team splits and lineups are not scraped yet: every opponent gets the same
+    # fixed K rates and eight right-handed batters. Flip once they are real.
+    PLACEHOLDER_OPPONENT_INPUTS = True
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
@@ -33,8 +44,8 @@ class MLBScraper:
         name = name.replace("AZ", "Arizona")
         return name.strip()
 
-    def get_mlb_pitchers(self) -> Dict[str, str]:
-        today = datetime.now().strftime('%Y-%m-%d')
+    def get_mlb_pitchers(self, date: Optional[datetime] = None) -> Dict[str, str]:
+        today = (date or datetime.now()).strftime('%Y-%m-%d')
         url = f'https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={today}&hydrate=probablePitcher'
         try:
             response = self.session.get(url, timeout=5)
@@ -57,8 +68,8 @@ class MLBScraper:
             print(f"❌ Error getting MLB pitchers: {e}")
             return {}
 
-    def get_todays_games(self) -> List[Dict]:
-        today = datetime.now()
+    def get_todays_games(self, date: Optional[datetime] = None) -> List[Dict]:
+        today = date or datetime.now()
         today_str = today.strftime("%Y%m%d")
         url = f"https://www.espn.com/mlb/schedule/_/date/{today_str}"
 
@@ -66,7 +77,7 @@ class MLBScraper:
             response = self.session.get(url, timeout=5)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
-            pitchers = self.get_mlb_pitchers()
+            pitchers = self.get_mlb_pitchers(today)
 
             schedule_blocks = soup.find_all("div", class_="ResponsiveTable")
             games = []
@@ -165,6 +176,108 @@ class MLBScraper:
             return self._default_pitcher_stats()
         """
 
+    def get_team_vs_handedness_stats(self, team: str, handedness: str) -> float:
+        """PLACEHOLDER: league-typical K% vs handedness, identical for every team"""
+        return 23.5 if handedness == 'R' else 25.2
+
+    def get_expected_batters(self, team: str) -> List[Dict]:
+        """PLACEHOLDER: eight generic right-handed batters, not the real lineup"""
+        return self._get_batters_for_team("", team)
+
+    def calculate_strikeout_projection(self, pitcher_stats: Dict, team_k_rate: float,
+                                       batters: List[Dict], innings: Optional[float] = None) -> Dict:
+        return self.calculate_strikeout_projections([{
+            'pitcher_stats': pitcher_stats,
+            'team_k_rate': team_k_rate,
+            'batters': batters,
+            'innings': innings
+        }])[0]
+
+    def expected_strikeouts(self, pitcher_stats: Dict, team_k_rate: float,
+                            batters: List[Dict], innings: Optional[float] = None) -> float:
+        rates = self._batter_rates(pitcher_stats, team_k_rate, batters, {})
+        return self._walk_lineup(rates, innings or DEFAULT_INNINGS)
+
+    def calculate_strikeout_projections(self, inputs: List[Dict]) -> List[Dict]:
+        """Project strikeouts for a batch of pitcher/lineup inputs.
+
+        Each input holds ``pitcher_stats``, ``team_k_rate``, ``batters``, an
+        optional ``innings`` workload and an optional ``scale`` on the total.
+        Strikeouts are modelled as Poisson around the expected total, which
+        gives the over probability for every betting line.
+
+        Work is shared across the batch: per-batter K rates are memoised on the
+        matchup values that determine them, so inputs against the same pitcher
+        and lineup only compute the batters they change, and totals that round
+        to the same projection share one table of line probabilities.
+        """
+        batter_rates = {}
+        line_tables = {}
+        projections = []
+        for projection_input in inputs:
+            rates = self._batter_rates(
+                projection_input['pitcher_stats'],
+                projection_input['team_k_rate'],
+                projection_input['batters'],
+                batter_rates
+            )
+            expected = self._walk_lineup(rates, projection_input.get('innings') or DEFAULT_INNINGS)
+            projected = round(expected * projection_input.get('scale', 1.0), 1)
+            if projected not in line_tables:
+                line_tables[projected] = self._line_table(projected)
+            projections.append({'projected_strikeouts': projected, **line_tables[projected]})
+        return projections
+
+    def _batter_rates(self, pitcher_stats: Dict, team_k_rate: float,
+                      batters: List[Dict], memo: Dict) -> List[float]:
+        pitcher_k = pitcher_stats['k_percent'] / 100
+        pitcher_hand = pitcher_stats.get('handedness', 'R')
+        rates = []
+        for batter in batters:
+            key = (pitcher_k, pitcher_hand, team_k_rate, batter['k_rate'], batter['handedness'])
+            if key not in memo:
+                memo[key] = (
+                    pitcher_k * (batter['k_rate'] + team_k_rate) / (2 * LEAGUE_K_RATE)
+                    * PLATOON_FACTOR[batter['handedness'] == pitcher_hand]
+                )
+            rates.append(memo[key])
+        return rates
+
+    def _walk_lineup(self, rates: List[float], innings: float) -> float:
+        if not rates:
+            return 0.0
+        # Walk the lineup in order, crediting a partial plate appearance at the end
+        batters_faced = innings * BATTERS_FACED_PER_INNING
+        full, partial = int(batters_faced), batters_faced - int(batters_faced)
+        laps, remainder = divmod(full, len(rates))
+        expected = laps * sum(rates) + sum(rates[:remainder])
+        return max(0.0, expected + partial * rates[remainder % len(rates)])
+
+    def _line_table(self, expected: float) -> Dict:
+        line_probabilities = self._over_probabilities(expected)
+        betting_line = max(
+            [line for line in BETTING_LINES if line < expected] or [BETTING_LINES[0]]
+        )
+        return {
+            'confidence': round(line_probabilities[str(betting_line)] * 100),
+            'betting_line': f'Over {betting_line}',
+            'line_probabilities': line_probabilities
+        }
+
+    def _over_probabilities(self, expected: float) -> Dict[str, float]:
+        expected = max(0.0, expected)
+        probabilities = {}
+        pmf = math.exp(-expected)
+        cdf = pmf
+        strikeouts = 0
+        for line in BETTING_LINES:
+            while strikeouts < int(line):
+                strikeouts += 1
+                pmf *= expected / strikeouts
+                cdf += pmf
+            probabilities[str(line)] = round(min(1.0, max(0.0, 1 - cdf)), 3)
+        return probabilities
+
     def _safe_float(self, value: str) -> float:
         try:
             return float(value.replace(',', ''))
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client serving the mock slate, with no network scraping"""
+    monkeypatch.setattr(main.scraper, "get_todays_games", lambda date=None: [])
+    main._slate_cache.clear()
+    main._slate_build_locks.clear()
+    yield TestClient(main.app)
+    main._slate_cache.clear()
+    main._slate_build_locks.clear()
@@ -0,0 +1,121 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import main
+
+
+def test_sparse_fields_keep_id(client):
+    response = client.get("/api/games/today?fields=projection")
+    assert response.status_code == 200
+    assert list(response.json()[0]) == ["id", "projection"]
+    assert set(response.json()[0]["projection"]) == {"home", "away"}
+
+
+def test_fragments_match_full_encoding(client):
+    game = main.get_mock_games()[0]
+    response = client.get("/api/games/1")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == main.jsonable_encoder(game)
+    assert client.get("/api/games/today").json() == [main.jsonable_encoder(game)]
+
+
+def test_duplicate_fields_are_collapsed(client):
+    game = client.get("/api/games/1?fields=game_time,id,game_time").json()
+    assert game == {"id": 1, "game_time": "7:05 PM ET"}
+
+
+def test_openapi_documents_game_shape(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    today = paths["/api/games/today"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    single = paths["/api/games/{game_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert today["items"]["$ref"].endswith("/Game")
+    assert single["$ref"].endswith("/Game")
+
+
+def test_unknown_field_is_rejected(client):
+    assert client.get("/api/games/today?fields=bogus").status_code == 400
+
+
+def test_get_game(client):
+    assert client.get("/api/games/1").json()["home_team"]["abbr"] == "NYY"
+    assert client.get("/api/games/99").status_code == 404
+
+
+def test_team_filter_matches_abbr_or_word_prefix(client):
+    for team in ("NYY", "bos", "Yankees", "red so", "Red Sox"):
+        assert len(client.get(f"/api/games/today?team={team}").json()) == 1, team
+    for team in ("a", "ees", "ny"):
+        assert client.get(f"/api/games/today?team={team}").json() == [], team
+
+
+def test_date_out_of_range_is_rejected(client):
+    assert client.get("/api/games/today?date=1900-01-01").status_code == 400
+    assert client.get("/api/games/today?date=2999-12-31").status_code == 400
+    assert client.get("/api/games/today?date=not-a-date").status_code == 400
+
+
+def test_mock_fallback_expires_quickly(client):
+    client.get("/api/games/today")
+    entry = next(iter(main._slate_cache.values()))
+    assert entry["expires_at"] - time.time() <= main.MOCK_SLATE_CACHE_TTL
+
+
+def test_slate_cache_is_bounded(client):
+    today = datetime.now()
+    for offset in range(main.SLATE_CACHE_MAX_DATES + 4):
+        date = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        assert client.get(f"/api/games/today?date={date}").status_code == 200
+    assert len(main._slate_cache) <= main.SLATE_CACHE_MAX_DATES
+
+
+def test_expired_slates_are_evicted(client):
+    client.get("/api/games/today")
+    with main._slate_cache_lock:
+        for entry in main._slate_cache.values():
+            entry["expires_at"] = time.time() - 1
+        main.evict_slates()
+    assert len(main._slate_cache) == 0
+
+
+def test_mock_fallback_survives_full_cache_of_real_slates(client):
+    # Real slates outlive the mock TTL; the fresh mock entry must still be served
+    today = datetime.now()
+    with main._slate_cache_lock:
+        for offset in range(1, main.SLATE_CACHE_MAX_DATES + 1):
+            key = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+            main._slate_cache[key] = {"expires_at": time.time() + main.SLATE_CACHE_TTL, "games": [], "inputs": {}}
+    
+    date = today.strftime("%Y-%m-%d")
+    assert client.get(f"/api/games/today?date={date}").status_code == 200
+    assert client.post("/api/scenarios", json={"date": date, "scenarios": [{"game_id": 1}]}).status_code == 200
+    assert len(main._slate_cache) == main.SLATE_CACHE_MAX_DATES
+    assert next(reversed(main._slate_cache)) == date
+
+
+def test_least_recently_used_slate_is_evicted(client):
+    today = datetime.now()
+    dates = [(today - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(main.SLATE_CACHE_MAX_DATES + 1)]
+    for date in dates[:-1]:
+        client.get(f"/api/games/today?date={date}")
+    client.get(f"/api/games/today?date={dates[0]}")
+    client.get(f"/api/games/today?date={dates[-1]}")
+    assert dates[0] in main._slate_cache
+    assert dates[1] not in main._slate_cache
+
+
+def test_concurrent_cold_misses_scrape_once(client, monkeypatch):
+    calls = []
+    
+    def slow_scrape(date=None):
+        calls.append(date)
+        time.sleep(0.05)
+        return []
+    
+    monkeypatch.setattr(main.scraper, "get_todays_games", slow_scrape)
+    threads = [threading.Thread(target=main.load_slate, args=(datetime.now(),)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
@@ -0,0 +1,140 @@
+import pytest
+from pydantic import ValidationError
+
+import main
+from scraper import DEFAULT_INNINGS
+
+
+@pytest.fixture
+def baseline():
+    return main.pitcher_inputs(
+        "Test Starter",
+        {**main.scraper._default_pitcher_stats(), "handedness": "R"},
+        23.0, 26.0,
+        [
+            {"name": "Lefty", "k_rate": 30.0, "handedness": "L", "vs_pitcher_history": 2},
+            {"name": "Righty", "k_rate": 18.0, "handedness": "R", "vs_pitcher_history": 1},
+        ],
+        6.0,
+        False
+    )
+
+
+def scenario(**overrides):
+    return main.Scenario(game_id=1, **overrides)
+
+
+def test_swap_replaces_batter(baseline):
+    replacement = main.Batter(name="Bench", k_rate=35.0, handedness="R", vs_pitcher_history=0)
+    inputs = main.apply_scenario(baseline, scenario(lineup_swaps=[{"out": "Lefty", "batter": replacement}]))
+    assert [batter["name"] for batter in inputs["batters"]] == ["Bench", "Righty"]
+
+
+def test_sit_keeps_lineup_length(baseline):
+    inputs = main.apply_scenario(baseline, scenario(lineup_swaps=[{"out": "Lefty"}]))
+    assert len(inputs["batters"]) == 2
+    assert inputs["batters"][0]["name"] == "Replacement for Lefty"
+    assert inputs["batters"][0]["k_rate"] == main.scraper._default_batters()[0]["k_rate"]
+
+
+def test_unknown_batter_is_rejected(baseline):
+    with pytest.raises(ValueError) as error:
+        main.apply_scenario(baseline, scenario(lineup_swaps=[{"out": "Nobody"}]))
+    assert "Nobody" in str(error.value)
+
+
+def test_empty_lineup_is_rejected(baseline):
+    with pytest.raises(ValueError):
+        main.apply_scenario({**baseline, "batters": []}, scenario())
+
+
+def test_handedness_picks_opponent_split(baseline):
+    assert main.apply_scenario(baseline, scenario())["team_k_rate"] == 23.0
+    inputs = main.apply_scenario(baseline, scenario(pitcher_handedness="L"))
+    assert inputs["team_k_rate"] == 26.0
+    assert inputs["pitcher_stats"]["handedness"] == "L"
+
+
+def test_innings_cap(baseline):
+    assert main.apply_scenario(baseline, scenario())["innings"] == DEFAULT_INNINGS
+    assert main.apply_scenario(baseline, scenario(innings_cap=4))["innings"] == 4
+    for cap in (0, -1, DEFAULT_INNINGS + 0.5):
+        with pytest.raises(ValidationError):
+            scenario(innings_cap=cap)
+
+
+def test_k_adjustment_is_floored_at_zero(baseline):
+    inputs = main.apply_scenario(baseline, scenario(opponent_k_adjustment=2.0))
+    assert inputs["team_k_rate"] == 25.0
+    assert [batter["k_rate"] for batter in inputs["batters"]] == [32.0, 20.0]
+    inputs = main.apply_scenario(baseline, scenario(opponent_k_adjustment=-60.0))
+    assert inputs["team_k_rate"] == 0.0
+    assert all(batter["k_rate"] == 0.0 for batter in inputs["batters"])
+
+
+def test_baseline_matches_games_endpoint(client):
+    game = client.get("/api/games/1").json()
+    results = client.post("/api/scenarios", json={"scenarios": [
+        {"game_id": 1, "side": "home"}, {"game_id": 1, "side": "away"}
+    ]}).json()
+    for side, result in zip(("home", "away"), results):
+        served = game[f"{side}_pitcher"]["projection"]["projected_strikeouts"]
+        assert result["baseline_strikeouts"] == served
+        assert result["projected_strikeouts"] == served
+        assert result["placeholder_inputs"] is True
+
+
+def test_mock_games_keep_hand_coded_projections(client):
+    projection = client.get("/api/games/1?fields=projection").json()["projection"]
+    assert projection["home"]["projected_strikeouts"] == 8.5
+    assert projection["away"]["projected_strikeouts"] == 9.2
+
+
+def test_mock_pitchers_face_the_opposing_lineup(client):
+    results = client.post("/api/scenarios", json={"scenarios": [
+        {"game_id": 1, "side": side, "lineup_swaps": [{"out": "Rafael Devers"}]} for side in ("home", "away")
+    ]}).json()
+    assert "error" not in results[0]
+    assert results[1]["error"] == "Batter 'Rafael Devers' is not in the opposing lineup"
+
+
+def test_scenarios_shift_the_served_projection(client):
+    results = client.post("/api/scenarios", json={"scenarios": [
+        {"game_id": 1, "side": "home", "innings_cap": 4},
+        {"game_id": 1, "side": "home", "opponent_k_adjustment": 3}
+    ]}).json()
+    assert results[0]["projected_strikeouts"] < 8.5 < results[1]["projected_strikeouts"]
+
+
+def test_large_negative_adjustment(client):
+    response = client.post("/api/scenarios", json={"scenarios": [
+        {"game_id": 1, "side": "home", "opponent_k_adjustment": -60}
+    ]})
+    assert response.status_code == 200
+    result = response.json()[0]
+    assert result["projected_strikeouts"] == 0.0
+    assert all(0.0 <= value <= 1.0 for value in result["line_probabilities"].values())
+
+
+def test_request_errors(client):
+    def post(*scenarios, **extra):
+        return client.post("/api/scenarios", json={"scenarios": list(scenarios), **extra}).status_code
+
+    assert post({"game_id": 1}, date="1900-01-01") == 400
+    assert post({"game_id": 1, "innings_cap": 9}) == 422
+    assert post({"game_id": 1, "innings_cap": 0}) == 422
+    assert post({"game_id": 1, "pitcher_handedness": "S"}) == 422
+    assert post(*[{"game_id": 1}] * (main.MAX_SCENARIOS + 1)) == 422
+
+
+def test_bad_scenarios_fail_alone(client):
+    response = client.post("/api/scenarios", json={"scenarios": [
+        {"game_id": 99, "name": "missing game"},
+        {"game_id": 1, "name": "bad swap", "lineup_swaps": [{"out": "Nobody"}]},
+        {"game_id": 1, "name": "ok", "innings_cap": 4}
+    ]})
+    assert response.status_code == 200
+    missing, bad, ok = response.json()
+    assert missing == {"name": "missing game", "game_id": 99, "side": "home", "error": "Game 99 not found"}
+    assert "Nobody" in bad["error"] and "projected_strikeouts" not in bad
+    assert "error" not in ok and ok["projected_strikeouts"] < ok["baseline_strikeouts"]
@@ -0,0 +1,69 @@
+import pytest
+
+from scraper import BETTING_LINES, MLBScraper
+
+
+@pytest.fixture
+def scraper():
+    return MLBScraper()
+
+
+@pytest.mark.parametrize("expected", [0.0, 0.4, 3.2, 6.8, 12.5, 25.0])
+def test_over_probabilities_are_monotonic_and_bounded(scraper, expected):
+    probabilities = scraper._over_probabilities(expected)
+    values = [probabilities[str(line)] for line in BETTING_LINES]
+    assert all(0.0 <= value <= 1.0 for value in values)
+    assert values == sorted(values, reverse=True)
+
+
+def test_over_probabilities_clamp_negative_mean(scraper):
+    assert set(scraper._over_probabilities(-11.4).values()) == {0.0}
+
+
+def test_projection_is_never_negative(scraper):
+    projection = scraper.calculate_strikeout_projection(
+        scraper._default_pitcher_stats(), -40.0,
+        [{**batter, 'k_rate': -40.0} for batter in scraper._default_batters()]
+    )
+    assert projection['projected_strikeouts'] == 0.0
+    assert all(0.0 <= value <= 1.0 for value in projection['line_probabilities'].values())
+
+
+def test_fewer_innings_fewer_strikeouts(scraper):
+    stats, batters = scraper._default_pitcher_stats(), scraper._default_batters()
+    full = scraper.calculate_strikeout_projection(stats, 23.5, batters)
+    short = scraper.calculate_strikeout_projection(stats, 23.5, batters, innings=4)
+    assert short['projected_strikeouts'] < full['projected_strikeouts']
+
+
+def test_batch_shares_line_tables_and_batter_rates(scraper, monkeypatch):
+    stats, batters = scraper._default_pitcher_stats(), scraper._default_batters()
+    line_tables, batter_rates = [], []
+    original_table, original_rates = scraper._line_table, scraper._batter_rates
+    monkeypatch.setattr(scraper, "_line_table", lambda expected: line_tables.append(expected) or original_table(expected))
+
+    def counting_rates(pitcher_stats, team_k_rate, batters, memo):
+        before = len(memo)
+        rates = original_rates(pitcher_stats, team_k_rate, batters, memo)
+        batter_rates.append(len(memo) - before)
+        return rates
+
+    monkeypatch.setattr(scraper, "_batter_rates", counting_rates)
+    inputs = [{'pitcher_stats': stats, 'team_k_rate': 23.5, 'batters': batters}] * 50
+    projections = scraper.calculate_strikeout_projections(inputs)
+    assert len(projections) == 50
+    assert len(line_tables) == 1
+    assert sum(batter_rates) == 1  # eight identical default batters share one rate
+
+
+def test_batch_matches_single_projections(scraper):
+    stats, batters = scraper._default_pitcher_stats(), scraper._default_batters()
+    inputs = [
+        {'pitcher_stats': stats, 'team_k_rate': rate, 'batters': batters, 'innings': innings}
+        for rate in (18.0, 23.5, 30.0) for innings in (3, 4.5, None)
+    ]
+    batch = scraper.calculate_strikeout_projections(inputs)
+    for projection_input, projection in zip(inputs, batch):
+        assert projection == scraper.calculate_strikeout_projection(
+            stats, projection_input['team_k_rate'], batters, projection_input['innings']
+        )